@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Response Cache Module
+=====================
+
+On-disk cache of model responses keyed by model name and conversation.
+Asking the same model the same conversation again returns the stored
+reply immediately instead of re-running generation.
+
+An optional semantic cache also matches paraphrased prompts by comparing
+prompt embeddings in a FAISS inner-product index. It is only active when
+SEMANTIC_CACHE_ENABLED is set and faiss/numpy are installed.
+
+Functions:
+    cache_key(model_name: str, messages: list) -> str
+    get_cached_response(key: str) -> str | None
+    store_response(key: str, response: str) -> None
+    semantic_cache_available() -> bool
+    get_similar_response(model_name: str, embedding: list) -> str | None
+    store_similar_response(model_name: str, embedding: list, response: str) -> None
+
+Usage:
+    from cache import cache_key, get_cached_response, store_response
+
+    key = cache_key(model_name, conversation)
+    response = get_cached_response(key)
+    if response is None:
+        response = generate(...)
+        store_response(key, response)
+"""
+
+import hashlib
+import sqlite3
+import time
+
+try:
+    import faiss
+    import numpy as np
+except ImportError:  # Semantic cache is optional
+    faiss = None
+
+from config import (
+    CACHE_FILE,
+    CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_ENABLED,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_INDEX_FILE
+)
+from ollama_utils import encode_messages
+
+# Lazily opened connection, shared for the lifetime of the process. Callers
+# use it one at a time but not always from the same thread (chat_async runs
+# each session's event loop in a new thread), hence check_same_thread=False.
+_connection = None
+
+# Lazily loaded FAISS index of normalized prompt embeddings. Row i of the
+# index corresponds to row id i of the semantic_responses table.
+_index = None
+
+# Number of nearest neighbours checked for a same-model match
+_SEARCH_K = 5
+
+
+def _connect():
+    """
+    Open the cache database, creating it on first use.
+
+    Returns:
+        sqlite3.Connection: Connection to CACHE_FILE
+    """
+    global _connection
+    if _connection is None:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _connection = sqlite3.connect(CACHE_FILE, check_same_thread=False)
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS semantic_responses ("
+            "id INTEGER PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL)"
+        )
+    return _connection
+
+
+def cache_key(model_name, messages):
+    """
+    Build the cache key for a conversation.
+
+    Args:
+        model_name (str): Name of the Ollama model
+        messages (list): Conversation as a list of {"role", "content"} dicts
+
+    Returns:
+        str: SHA-256 hex digest of the model name and conversation
+
+    Note:
+        Hashes the same memoized message encoding used for the request body,
+        so earlier messages are not re-serialized on every turn.
+    """
+    digest = hashlib.sha256(model_name.encode('utf-8'))
+    digest.update(encode_messages(messages))
+    return digest.hexdigest()
+
+
+def get_cached_response(key):
+    """
+    Look up a cached response and mark it as recently used.
+
+    Args:
+        key (str): Key returned by cache_key()
+
+    Returns:
+        str | None: The cached response, or None on a miss or cache error
+    """
+    try:
+        conn = _connect()
+        row = conn.execute(
+            "SELECT response FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        with conn:
+            conn.execute(
+                "UPDATE responses SET last_used = ? WHERE key = ?",
+                (time.time(), key)
+            )
+        return row[0]
+    except sqlite3.Error:
+        return None
+
+
+def store_response(key, response):
+    """
+    Store a response, evicting the least recently used entries over the limit.
+
+    Args:
+        key (str): Key returned by cache_key()
+        response (str): Model response to cache
+
+    Note:
+        Cache errors are ignored - a failed write only means a future miss.
+    """
+    try:
+        conn = _connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, last_used) "
+                "VALUES (?, ?, ?)",
+                (key, response, time.time())
+            )
+            conn.execute(
+                "DELETE FROM responses WHERE key NOT IN ("
+                "SELECT key FROM responses ORDER BY last_used DESC LIMIT ?)",
+                (CACHE_MAX_ENTRIES,)
+            )
+    except sqlite3.Error:
+        pass
+
+
+def semantic_cache_available():
+    """
+    Check whether the semantic cache can be used.
+
+    Returns:
+        bool: True if it is enabled in config and faiss/numpy are installed
+    """
+    return SEMANTIC_CACHE_ENABLED and faiss is not None
+
+
+def _normalize(embedding):
+    """
+    Convert an embedding to a unit-length FAISS query vector.
+
+    Args:
+        embedding (list[float]): Raw embedding vector
+
+    Returns:
+        numpy.ndarray: float32 array of shape (1, dim)
+    """
+    vector = np.array([embedding], dtype='float32')
+    faiss.normalize_L2(vector)
+    return vector
+
+
+def _load_index(dim):
+    """
+    Load the semantic index from disk, or create an empty one.
+
+    Args:
+        dim (int): Embedding dimension, used when creating a new index
+
+    Returns:
+        faiss.Index | None: The index, or None if the stored index has a
+            different dimension (e.g. EMBED_MODEL was changed)
+    """
+    global _index
+    if _index is None:
+        if SEMANTIC_INDEX_FILE.exists():
+            _index = faiss.read_index(str(SEMANTIC_INDEX_FILE))
+        else:
+            _index = faiss.IndexFlatIP(dim)
+    return _index if _index.d == dim else None
+
+
+def get_similar_response(model_name, embedding):
+    """
+    Find a cached response to a semantically similar prompt.
+
+    Args:
+        model_name (str): Name of the Ollama model the response must come from
+        embedding (list[float]): Embedding of the prompt being asked
+
+    Returns:
+        str | None: Response whose prompt has cosine similarity of at least
+            SEMANTIC_CACHE_THRESHOLD, or None on a miss or cache error
+    """
+    try:
+        index = _load_index(len(embedding))
+        if index is None or index.ntotal == 0:
+            return None
+        scores, ids = index.search(_normalize(embedding), min(_SEARCH_K, index.ntotal))
+        conn = _connect()
+        for score, row_id in zip(scores[0], ids[0]):
+            if score < SEMANTIC_CACHE_THRESHOLD:
+                break
+            row = conn.execute(
+                "SELECT response FROM semantic_responses WHERE id = ? AND model = ?",
+                (int(row_id), model_name)
+            ).fetchone()
+            if row is not None:
+                return row[0]
+        return None
+    except (sqlite3.Error, RuntimeError):
+        return None
+
+
+def store_similar_response(model_name, embedding, response):
+    """
+    Add a prompt embedding and its response to the semantic cache.
+
+    Args:
+        model_name (str): Name of the Ollama model that produced the response
+        embedding (list[float]): Embedding of the prompt
+        response (str): Model response to cache
+
+    Note:
+        The index is written to SEMANTIC_INDEX_FILE after every addition.
+        Cache errors are ignored - a failed write only means a future miss.
+    """
+    try:
+        index = _load_index(len(embedding))
+        if index is None:
+            return
+        conn = _connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO semantic_responses (id, model, response) VALUES (?, ?, ?)",
+                (index.ntotal, model_name, response)
+            )
+            index.add(_normalize(embedding))
+        SEMANTIC_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+        faiss.write_index(index, str(SEMANTIC_INDEX_FILE))
+    except (sqlite3.Error, RuntimeError):
+        pass
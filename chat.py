@@ -13,7 +13,11 @@ Usage:
 
 Features:
     - Interactive model selection
-    - Persistent conversation history per session
+    - Persistent conversation history per session, with older messages
+      summarized once it grows long
+    - Streaming responses, printed as they are generated
+    - On-disk cache of responses to identical conversations, plus an
+      optional semantic cache for paraphrased opening questions
     - Runtime commands (/clear, /models, exit, quit)
     - Automatic environment setup
 
@@ -27,22 +31,222 @@ Requirements:
     - At least one model must be downloaded
 """
 
+import io
 import sys
-import subprocess
-
-# Set UTF-8 encoding for Windows console
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
-from config import MODELS, SEPARATOR
+
+from cache import (
+    cache_key,
+    get_cached_response,
+    get_similar_response,
+    semantic_cache_available,
+    store_response,
+    store_similar_response
+)
+from config import MODEL_INDEX, MODEL_MENU, SEPARATOR
 from ollama_utils import (
+    chat_completion,
     check_ollama_running,
+    embed_text,
     list_installed_models,
-    setup_environment
+    preload_model,
+    setup_environment,
+    stream_chat
+)
+
+# Repetition detection: once a reply is at least REPETITION_WINDOW words
+# long, the stream is stopped if fewer than REPETITION_MIN_UNIQUE of the
+# most recent REPETITION_WINDOW words are distinct (the model is looping)
+REPETITION_WINDOW = 60
+REPETITION_MIN_UNIQUE = 0.2
+
+# Streamed tokens are flushed to the console on newlines and at least every
+# STREAM_FLUSH_TOKENS tokens, rather than once per token
+STREAM_FLUSH_TOKENS = 8
+
+# History compaction: once the messages after the summary exceed
+# HISTORY_MAX_CHARS, they are folded into the summary except for the most
+# recent exchanges - at most HISTORY_KEEP_MESSAGES messages and
+# HISTORY_KEEP_CHARS characters. Keeping well under the limit means the next
+# compaction only happens after that much new conversation.
+HISTORY_MAX_CHARS = 8000
+HISTORY_KEEP_MESSAGES = 6
+HISTORY_KEEP_CHARS = HISTORY_MAX_CHARS // 2
+SUMMARY_PREFIX = "Prior conversation summary: "
+SUMMARY_INSTRUCTION = (
+    "Summarize the conversation so far in a few sentences. Keep names, "
+    "facts, decisions and open questions. Reply with the summary only."
 )
 
 
+def make_message(role, content):
+    """
+    Build a conversation entry in its canonical form.
+
+    Args:
+        role (str): 'system', 'user' or 'assistant'
+        content (str): Message text, stored exactly as given
+
+    Returns:
+        dict: {"role": role, "content": content}
+
+    Note:
+        Every entry is created here so messages serialize to identical bytes
+        on every turn, which keeps both Ollama's prefix cache and the response
+        cache keys stable. Entries must never be modified after they are
+        appended to the history - editing or reordering earlier messages
+        invalidates the cached prefix. Only append (or compact_history()).
+    """
+    return {"role": role, "content": content}
+
+
+def is_repeating(text):
+    """
+    Detect whether a response has degenerated into endless repetition.
+
+    Args:
+        text (str): Response text generated so far
+
+    Returns:
+        bool: True if the most recent words are mostly repeats of each other
+    """
+    # Only the tail matters; avoid re-splitting the whole reply per token
+    words = text[-REPETITION_WINDOW * 20:].split()
+    if len(words) < REPETITION_WINDOW:
+        return False
+    window = words[-REPETITION_WINDOW:]
+    return len(set(window)) / REPETITION_WINDOW < REPETITION_MIN_UNIQUE
+
+
+def compact_history(model_name, conversation):
+    """
+    Replace older messages with a summary once the history grows too long.
+
+    Args:
+        model_name (str): Name of the Ollama model used to write the summary
+        conversation (list): Conversation history, modified in place
+
+    Returns:
+        bool: True if the history was compacted
+
+    Note:
+        Only the messages after the current summary count towards
+        HISTORY_MAX_CHARS, and the verbatim tail kept after a compaction is
+        at most HISTORY_KEEP_CHARS, so long replies don't trigger a summary
+        on every turn. The summary request sends the older messages
+        unchanged followed by an instruction, so Ollama can reuse its cached
+        prefix. Between compactions the history stays append-only.
+    """
+    has_summary = (
+        bool(conversation)
+        and conversation[0]["role"] == "system"
+        and conversation[0]["content"].startswith(SUMMARY_PREFIX)
+    )
+    sizes = [len(msg["content"]) for msg in conversation[int(has_summary):]]
+    if sum(sizes) <= HISTORY_MAX_CHARS:
+        return False
+
+    # Keep the most recent whole exchanges that fit the tail budget
+    keep = min(HISTORY_KEEP_MESSAGES, len(sizes))
+    keep -= keep % 2
+    while keep and sum(sizes[-keep:]) > HISTORY_KEEP_CHARS:
+        keep -= 2
+    split = len(conversation) - keep
+
+    summary = chat_completion(
+        model_name,
+        conversation[:split] + [make_message("user", SUMMARY_INSTRUCTION)]
+    )
+    conversation[:split] = [
+        make_message("system", SUMMARY_PREFIX + summary.strip())
+    ]
+    return True
+
+
+class ReplyPrinter:
+    """
+    Print a streamed reply to the console as its tokens arrive.
+
+    Shared by chat.py and chat_async.py, which differ only in how the
+    tokens are received.
+
+    Attributes:
+        response (str): Text of the reply received so far
+    """
+
+    def __init__(self):
+        self.response = ""
+        self._pending = 0
+
+    def add(self, token):
+        """
+        Print a token and append it to the reply.
+
+        Args:
+            token (str): Next piece of the reply
+
+        Returns:
+            bool: False if the reply is repeating itself and the stream
+                  should be stopped
+
+        Note:
+            Output is flushed on newlines and every STREAM_FLUSH_TOKENS
+            tokens; the caller flushes once the stream ends.
+        """
+        sys.stdout.write(token)
+        self._pending += 1
+        if self._pending >= STREAM_FLUSH_TOKENS or "\n" in token:
+            sys.stdout.flush()
+            self._pending = 0
+        self.response += token
+        if is_repeating(self.response):
+            sys.stdout.write("\n[Stopped: response was repeating itself]")
+            return False
+        return True
+
+
+def stream_reply(model_name, messages):
+    """
+    Stream a reply to the console as it is generated.
+
+    Args:
+        model_name (str): Name of the Ollama model to use
+        messages (list): Conversation as a list of {"role", "content"} dicts
+
+    Returns:
+        tuple: (response: str, completed: bool)
+            - response: Full text of the reply
+            - completed: False if the stream was stopped for repetition
+    """
+    printer = ReplyPrinter()
+    stream = stream_chat(model_name, messages)
+    try:
+        for token in stream:
+            if not printer.add(token):
+                return printer.response, False
+    finally:
+        stream.close()
+        sys.stdout.flush()
+    return printer.response, True
+
+
+def configure_console():
+    """
+    Set UTF-8 encoding for the Windows console.
+
+    Note:
+        stdout is block buffered so streamed tokens are batched into fewer
+        console writes; the chat flushes explicitly where output must appear
+        immediately (and input() flushes too). Called from main() rather
+        than at import, so importing this module has no side effects.
+    """
+    if sys.platform == 'win32':
+        sys.stdout = io.TextIOWrapper(
+            sys.stdout.buffer, encoding='utf-8', errors='replace',
+            line_buffering=False, write_through=False
+        )
+        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+
 def select_model():
     """
     Display available models and let user select one.
@@ -51,26 +255,42 @@ def select_model():
         str: Name of the selected model
 
     Note:
-        If user enters an invalid choice, defaults to the first model
-        in the MODELS list (typically dolphin-mistral).
+        Only models that fit in system RAM are listed (see config.MODEL_INDEX).
+        If user enters an invalid choice, defaults to the first listed model.
     """
-    print(f"\n{SEPARATOR}")
-    print("AVAILABLE UNCENSORED MODELS")
-    print(SEPARATOR)
+    print("\n".join([
+        f"\n{SEPARATOR}",
+        "AVAILABLE UNCENSORED MODELS",
+        SEPARATOR,
+        MODEL_MENU,
+        SEPARATOR
+    ]))
+
+    choice = input(f"\nSelect model (1-{len(MODEL_INDEX)}): ").strip()
+    if choice in MODEL_INDEX:
+        return MODEL_INDEX[choice]['name']
+    else:
+        default = MODEL_INDEX['1']
+        print(f"Invalid choice, using default ({default['description']})")
+        return default['name']
 
-    # Create numbered dict for selection
-    model_dict = {str(i+1): model for i, model in enumerate(MODELS)}
 
-    for key, model in model_dict.items():
-        print(f"{key}. {model['description']} - {model['details']}")
-    print(SEPARATOR)
+def print_chat_banner(model_name):
+    """
+    Print the chat session header with the available commands.
 
-    choice = input(f"\nSelect model (1-{len(MODELS)}): ").strip()
-    if choice in model_dict:
-        return model_dict[choice]['name']
-    else:
-        print("Invalid choice, using default (Dolphin Mistral)")
-        return MODELS[0]['name']
+    Args:
+        model_name (str): Name of the model being chatted with
+    """
+    print("\n".join([
+        f"\n{SEPARATOR}",
+        f"Starting chat with {model_name}",
+        SEPARATOR,
+        "Type 'exit', 'quit', or press Ctrl+C to end the conversation",
+        "Type '/clear' to clear conversation history",
+        "Type '/models' to switch models",
+        f"{SEPARATOR}\n"
+    ]))
 
 
 def chat(model_name):
@@ -81,25 +301,42 @@ def chat(model_name):
         model_name (str): Name of the Ollama model to use
 
     Returns:
-        bool: True if user wants to switch models, False if exiting
+        bool: True if user wants to switch models (or the model could not
+              be loaded), False if exiting
 
     Features:
         - Maintains conversation history throughout the session
         - Supports special commands (/clear, /models)
         - Handles keyboard interrupts gracefully
-        - Formats conversation context for the model
+        - Sends the full conversation to the model for context
+        - Loads the model before the first message
+        - Streams the reply and stops early if the model starts looping
+        - Answers repeated conversations from the response cache
+        - Summarizes older messages once the history gets long
 
     Note:
-        The conversation history is maintained by concatenating all
-        previous messages into a single prompt for context continuity.
+        Requests go through the Ollama HTTP API over a persistent
+        connection, and the model stays loaded between turns. The history
+        is sent as a structured messages list and only ever appended to,
+        so Ollama can reuse the KV cache for the unchanged prefix and only
+        process the newest message.
     """
-    print(f"\n{SEPARATOR}")
-    print(f"Starting chat with {model_name}")
-    print(SEPARATOR)
-    print("Type 'exit', 'quit', or press Ctrl+C to end the conversation")
-    print("Type '/clear' to clear conversation history")
-    print("Type '/models' to switch models")
-    print(f"{SEPARATOR}\n")
+    print_chat_banner(model_name)
+
+    # Load the model now so the first message doesn't pay the load time
+    print(f"Loading {model_name}...", flush=True)
+    try:
+        is_loaded, error = preload_model(model_name)
+    except KeyboardInterrupt:
+        print("\n\nGoodbye!")
+        return False
+    if error:
+        print(f"✗ Could not load {model_name}: {error}\n")
+        return True  # Back to model selection
+    if is_loaded:
+        print("✓ Model loaded\n")
+    else:
+        print("Model is still loading, the first reply may be slow\n")
 
     conversation = []
 
@@ -123,48 +360,54 @@ def chat(model_name):
                 return True  # Signal to restart with model selection
 
             # Add user message to conversation
-            conversation.append({
-                "role": "user",
-                "content": user_input
-            })
-
-            # Build the prompt
-            prompt = ""
-            for msg in conversation:
-                if msg["role"] == "user":
-                    prompt += f"User: {msg['content']}\n"
-                else:
-                    prompt += f"Assistant: {msg['content']}\n"
-            prompt += "Assistant: "
-
-            # Call ollama
-            result = subprocess.run(
-                ['ollama', 'run', model_name, prompt],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace'
-            )
-
-            if result.returncode != 0:
-                print(f"\nError: {result.stderr}")
-                continue
-
-            response = result.stdout.strip()
-
-            # Add assistant response to conversation
-            conversation.append({
-                "role": "assistant",
-                "content": response
-            })
-
-            print(f"\n{model_name}: {response}\n")
+            conversation.append(make_message("user", user_input))
+
+            print(f"\n{model_name}: ", end="", flush=True)
+
+            # Answer identical conversations from the cache. An opening
+            # question may also be answered from a semantically similar one;
+            # follow-ups depend on earlier turns, so they must match exactly.
+            key = cache_key(model_name, conversation)
+            response = get_cached_response(key)
+            embedding = None
+            if (response is None and len(conversation) == 1
+                    and semantic_cache_available()):
+                embedding = embed_text(user_input)
+                if embedding is not None:
+                    response = get_similar_response(model_name, embedding)
+
+            if response is not None:
+                print(response, end="")
+            else:
+                # Stream the reply from ollama
+                response, completed = stream_reply(model_name, conversation)
+                if completed:
+                    store_response(key, response)
+                    if embedding is not None:
+                        store_similar_response(model_name, embedding, response)
+            print("\n")
+
+            # Add assistant response to conversation exactly as generated.
+            # The history is append-only so every request starts with the
+            # same messages as the previous one, letting Ollama reuse its
+            # cached prefix instead of re-processing the whole conversation.
+            conversation.append(make_message("assistant", response))
+
+            # Keep long conversations within the model's context
+            try:
+                if compact_history(model_name, conversation):
+                    print("[Older messages summarized to keep the conversation short]\n")
+            except Exception as e:
+                print(f"[Could not summarize history: {e}]\n")
 
         except KeyboardInterrupt:
             print("\n\nGoodbye!")
             break
         except Exception as e:
             print(f"\nError: {e}")
+            # Drop the unanswered user message to keep history well-formed
+            if conversation and conversation[-1]["role"] == "user":
+                conversation.pop()
             continue
 
     return False
@@ -183,21 +426,22 @@ def main():
         4. Enter chat loop with model selection
         5. Allow switching models without restarting
     """
-    print(f"\n{SEPARATOR}")
-    print("UNCENSORED LLM CHAT")
-    print(SEPARATOR)
+    configure_console()
+    print(f"\n{SEPARATOR}\nUNCENSORED LLM CHAT\n{SEPARATOR}")
 
     # Setup environment
     setup_environment()
 
     # Check if Ollama is installed
     if not check_ollama_running():
-        print("\n⚠️  Ollama is not installed or not running!")
-        print("\nTo install Ollama:")
-        print("1. Download from: https://ollama.ai")
-        print("2. Run the installer")
-        print("3. Restart this script")
-        print("\nAfter installation, run: python setup_ollama.py")
+        print("\n".join([
+            "\n⚠️  Ollama is not installed or not running!",
+            "\nTo install Ollama:",
+            "1. Download from: https://ollama.ai",
+            "2. Run the installer",
+            "3. Restart this script",
+            "\nAfter installation, run: python setup_ollama.py"
+        ]))
         sys.exit(1)
 
     print("\n✓ Ollama is installed and running")
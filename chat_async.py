@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Async Chat Interface for Uncensored Models
+==========================================
+
+An asyncio-based variant of chat.py built on httpx.AsyncClient. The model
+is loaded in the background while the user types the first message, and
+independent prompts can be sent concurrently with run_prompts().
+
+Usage:
+    python chat_async.py
+
+Functions:
+    stream_chat_async(client, model_name, messages) -> AsyncIterator[str]
+    generate(client, model_name, prompt) -> str
+    run_prompts(model_name, prompts) -> list[str | Exception]
+    chat(model_name) -> bool
+    run_with_console(coro) -> Any
+
+Commands:
+    exit, quit  - Exit the chat application
+    /clear      - Clear conversation history
+    /models     - Switch to a different model
+
+Requirements:
+    - httpx (pip install httpx)
+    - Ollama must be installed and running
+    - At least one model must be downloaded
+"""
+
+import asyncio
+import concurrent.futures
+import queue
+import sys
+import threading
+
+import httpx
+
+from cache import cache_key, get_cached_response, store_response
+from chat import (
+    ReplyPrinter,
+    compact_history,
+    configure_console,
+    make_message,
+    print_chat_banner,
+    select_model
+)
+from config import KEEP_ALIVE, OLLAMA_HOST, SEPARATOR
+from ollama_utils import (
+    JSON_HEADERS,
+    chat_request_body,
+    check_ollama_running,
+    error_message,
+    list_installed_models,
+    parse_chat_line,
+    setup_environment
+)
+
+# Console input requests from _input(), served by run_with_console() on the
+# main thread: (prompt, future) tuples, or None once the coroutine finishes
+_input_requests = queue.Queue()
+
+
+def _client(timeout=None):
+    """
+    Create an async HTTP client for the Ollama API.
+
+    Args:
+        timeout (float | None): Request timeout in seconds, None for no limit
+
+    Returns:
+        httpx.AsyncClient: Client with base_url set to OLLAMA_HOST
+    """
+    return httpx.AsyncClient(base_url=OLLAMA_HOST, timeout=timeout)
+
+
+async def _raise_for_status(response, model_name):
+    """
+    Raise an error carrying Ollama's own message for a failed request.
+
+    Args:
+        response (httpx.Response): Response from the Ollama API
+        model_name (str): Model the request was for, used in the hint
+
+    Raises:
+        httpx.HTTPStatusError: If the response has an error status, with the
+            message from ollama_utils.error_message()
+    """
+    if not response.is_error:
+        return
+    await response.aread()
+    message = error_message(
+        response.status_code, response.reason_phrase, response.content, model_name
+    )
+    raise httpx.HTTPStatusError(message, request=response.request, response=response)
+
+
+async def stream_chat_async(client, model_name, messages):
+    """
+    Stream the assistant's reply from the Ollama chat API.
+
+    Args:
+        client (httpx.AsyncClient): Client created by _client()
+        model_name (str): Name of the Ollama model to use
+        messages (list): Conversation as a list of {"role", "content"} dicts
+
+    Yields:
+        str: Pieces of the reply content as they are generated
+
+    Raises:
+        httpx.HTTPError: If the Ollama service is unreachable or returns
+            an error status
+    """
+    async with client.stream(
+        "POST",
+        "/api/chat",
+        content=chat_request_body(model_name, messages, stream=True),
+        headers=JSON_HEADERS
+    ) as response:
+        await _raise_for_status(response, model_name)
+        async for line in response.aiter_lines():
+            content, done, error = parse_chat_line(line)
+            if error:
+                raise httpx.HTTPError(error)
+            if content:
+                yield content
+            if done:
+                break
+
+
+async def generate(client, model_name, prompt):
+    """
+    Send a single prompt and return the complete reply.
+
+    Args:
+        client (httpx.AsyncClient): Client created by _client()
+        model_name (str): Name of the Ollama model to use
+        prompt (str): User prompt
+
+    Returns:
+        str: The model's reply
+    """
+    response = await client.post(
+        "/api/chat",
+        content=chat_request_body(model_name, [make_message("user", prompt)], stream=False),
+        headers=JSON_HEADERS
+    )
+    await _raise_for_status(response, model_name)
+    return response.json()["message"]["content"]
+
+
+async def run_prompts(model_name, prompts, timeout=60):
+    """
+    Send several independent prompts concurrently.
+
+    Args:
+        model_name (str): Name of the Ollama model to use
+        prompts (list[str]): Prompts to send
+        timeout (float): Per-request timeout in seconds
+
+    Returns:
+        list: One entry per prompt, in order - the reply text, or the
+              exception raised for that prompt
+
+    Example:
+        >>> asyncio.run(run_prompts('dolphin-mistral:latest', ['Hi', 'Bye']))
+    """
+    async with _client(timeout) as client:
+        return await asyncio.gather(
+            *(generate(client, model_name, prompt) for prompt in prompts),
+            return_exceptions=True
+        )
+
+
+async def _warm_up(client, model_name):
+    """
+    Load the model into memory without generating anything.
+
+    Args:
+        client (httpx.AsyncClient): Client created by _client()
+        model_name (str): Name of the Ollama model to load
+
+    Note:
+        Errors are ignored - the first real request reports them instead.
+    """
+    try:
+        await client.post(
+            "/api/generate",
+            json={"model": model_name, "prompt": "", "keep_alive": KEEP_ALIVE}
+        )
+    except httpx.HTTPError:
+        pass
+
+
+async def _stream_reply(client, model_name, messages):
+    """
+    Stream a reply to the console as it is generated.
+
+    Args:
+        client (httpx.AsyncClient): Client created by _client()
+        model_name (str): Name of the Ollama model to use
+        messages (list): Conversation as a list of {"role", "content"} dicts
+
+    Returns:
+        tuple: (response: str, completed: bool)
+            - response: Full text of the reply
+            - completed: False if the stream was stopped for repetition
+    """
+    printer = ReplyPrinter()
+    stream = stream_chat_async(client, model_name, messages)
+    try:
+        async for token in stream:
+            if not printer.add(token):
+                return printer.response, False
+    finally:
+        await stream.aclose()
+        sys.stdout.flush()
+    return printer.response, True
+
+
+async def _in_daemon_thread(func, *args):
+    """
+    Run a blocking call in a daemon thread and await its result.
+
+    Args:
+        func (callable): Blocking function to call
+        *args: Arguments passed to func
+
+    Returns:
+        The return value of func (its exception is re-raised)
+
+    Note:
+        Unlike loop.run_in_executor(), the thread is not joined at exit, so
+        Ctrl+C exits immediately even while the call is still running.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(result, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def run():
+        result, error = None, None
+        try:
+            result = func(*args)
+        except BaseException as e:
+            error = e
+        try:
+            loop.call_soon_threadsafe(resolve, result, error)
+        except RuntimeError:
+            pass  # Event loop already closed
+
+    threading.Thread(target=run, daemon=True).start()
+    return await future
+
+
+async def _input(prompt):
+    """
+    Read a line from the console without blocking the event loop.
+
+    Args:
+        prompt (str): Prompt shown to the user
+
+    Returns:
+        str: The line entered, stripped of surrounding whitespace
+
+    Note:
+        The line is read by the main thread in run_with_console(), which
+        owns stdin, so Ctrl+C and EOF are raised there as usual.
+    """
+    future = asyncio.get_running_loop().create_future()
+    _input_requests.put((prompt, future))
+    line = await future
+    return line.strip()
+
+
+def run_with_console(coro):
+    """
+    Run a coroutine that reads console input via _input().
+
+    Args:
+        coro (coroutine): Coroutine to run, e.g. chat(model_name)
+
+    Returns:
+        The coroutine's return value
+
+    Raises:
+        KeyboardInterrupt: On Ctrl+C, without waiting for the coroutine
+        EOFError: If stdin is closed while input is requested
+
+    Note:
+        The event loop runs in a daemon thread while the main thread serves
+        input() requests. Blocking input() therefore never runs inside an
+        executor that asyncio.run() would have to join on Ctrl+C, and
+        background work (like the model warm-up) keeps running while the
+        user types.
+    """
+    loop = asyncio.new_event_loop()
+    outcome = concurrent.futures.Future()
+
+    def run_loop():
+        try:
+            outcome.set_result(loop.run_until_complete(coro))
+        except BaseException as e:
+            outcome.set_exception(e)
+        finally:
+            _input_requests.put(None)  # Wake the main thread
+
+    threading.Thread(target=run_loop, daemon=True).start()
+    while True:
+        try:
+            # Poll with a timeout so Ctrl+C is handled promptly on Windows too
+            request = _input_requests.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if request is None:
+            loop.close()
+            return outcome.result()
+        prompt, future = request
+        line = input(prompt)
+        loop.call_soon_threadsafe(future.set_result, line)
+
+
+async def chat(model_name):
+    """
+    Start an interactive async chat session with the specified model.
+
+    Args:
+        model_name (str): Name of the Ollama model to use
+
+    Returns:
+        bool: True if user wants to switch models, False if exiting
+
+    Note:
+        The model starts loading as soon as the session opens, so the load
+        time overlaps with the user typing the first message.
+    """
+    print_chat_banner(model_name)
+
+    conversation = []
+
+    async with _client() as client:
+        warm_up = asyncio.ensure_future(_warm_up(client, model_name))
+        try:
+            while True:
+                user_input = await _input("You: ")
+
+                if not user_input:
+                    continue
+
+                if user_input.lower() in ['exit', 'quit']:
+                    print("\nGoodbye!")
+                    return False
+
+                if user_input == '/clear':
+                    conversation = []
+                    print("\n[Conversation history cleared]\n")
+                    continue
+
+                if user_input == '/models':
+                    return True  # Signal to restart with model selection
+
+                conversation.append(make_message("user", user_input))
+
+                print(f"\n{model_name}: ", end="", flush=True)
+                try:
+                    key = cache_key(model_name, conversation)
+                    response = get_cached_response(key)
+                    if response is not None:
+                        print(response, end="")
+                    else:
+                        response, completed = await _stream_reply(
+                            client, model_name, conversation
+                        )
+                        if completed:
+                            store_response(key, response)
+                    print("\n")
+                except Exception as e:
+                    print(f"\nError: {e}")
+                    # Drop the unanswered user message to keep history well-formed
+                    conversation.pop()
+                    continue
+
+                conversation.append(make_message("assistant", response))
+
+                # Summarize older messages in a worker thread
+                try:
+                    if await _in_daemon_thread(compact_history, model_name, conversation):
+                        print("[Older messages summarized to keep the conversation short]\n")
+                except Exception as e:
+                    print(f"[Could not summarize history: {e}]\n")
+        finally:
+            warm_up.cancel()
+
+
+def main():
+    """
+    Main entry point for the async chat application.
+
+    Workflow:
+        1. Setup environment variables
+        2. Verify Ollama is running
+        3. Display installed models
+        4. Enter chat loop with model selection
+    """
+    configure_console()
+    print(f"\n{SEPARATOR}")
+    print("UNCENSORED LLM CHAT (ASYNC)")
+    print(SEPARATOR)
+
+    setup_environment()
+
+    if not check_ollama_running():
+        print("\n⚠️  Ollama is not installed or not running!")
+        print("\nAfter installation, run: python setup_ollama.py")
+        sys.exit(1)
+
+    print("\n✓ Ollama is installed and running")
+    print("\nInstalled models:")
+    print(list_installed_models())
+
+    try:
+        while True:
+            model_name = select_model()
+            if not run_with_console(chat(model_name)):
+                break
+    except (KeyboardInterrupt, EOFError):
+        print("\n\nGoodbye!")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,23 +9,79 @@ This is the single source of truth for all configuration values.
 Usage:
     from config import MODEL_DIR, MODELS, SEPARATOR
 
+    large_models = get_models(tag='premium')
+    fitting_models = get_models(max_ram=16)
+
 Attributes:
     MODEL_DIR (Path): Directory where Ollama models are stored
+    OLLAMA_HOST (str): Base URL of the local Ollama HTTP API
+    KEEP_ALIVE (str): How long Ollama keeps a model loaded between requests
+    NUM_PARALLEL (int): Recommended OLLAMA_NUM_PARALLEL (concurrent requests per model)
+    MAX_LOADED_MODELS (int): Default OLLAMA_MAX_LOADED_MODELS
+    CACHE_FILE (Path): SQLite database holding cached chat responses
+    CACHE_MAX_ENTRIES (int): Maximum number of cached responses kept
+    SEMANTIC_CACHE_ENABLED (bool): Also answer paraphrased prompts from cache
+    SEMANTIC_CACHE_THRESHOLD (float): Minimum cosine similarity for a hit
+    SEMANTIC_INDEX_FILE (Path): FAISS index of cached prompt embeddings
+    EMBED_MODEL (str): Ollama model used to embed prompts
     MODELS (list): List of available model configurations
+    SYSTEM_RAM_GB (float | None): Total system RAM, None if psutil is missing
+    MODEL_INDEX (dict): Menu number (as a string, from "1") to the configuration
+        of each model that fits in SYSTEM_RAM_GB
+    MODEL_MENU (str): Pre-formatted model selection menu for MODEL_INDEX
     SEPARATOR (str): Formatting separator for CLI output
+
+Functions:
+    get_models(tag: str | None, max_ram: float | None) -> list
 """
 
 from pathlib import Path
 
+try:
+    import psutil
+except ImportError:  # RAM-based model filtering is optional
+    psutil = None
+
 # Model storage directory
 # This path will be set as the OLLAMA_MODELS environment variable
 MODEL_DIR = Path("D:/llm-models")
 
+# Ollama HTTP API endpoint (default port of the Ollama service)
+OLLAMA_HOST = "http://localhost:11434"
+
+# Keep the model resident in memory between chat turns so each message
+# does not pay the cost of reloading weights from disk
+KEEP_ALIVE = "30m"
+
+# Ollama server concurrency. These are read by the Ollama server at startup,
+# so they only take effect once persisted (see print_env_setup_instructions()).
+# NUM_PARALLEL: requests served at once by a single loaded model. Each slot
+#   reserves its own context (KV cache) memory.
+# MAX_LOADED_MODELS: models kept in memory at the same time (48GB RAM fits two
+#   of the 7B-13B models comfortably)
+NUM_PARALLEL = 4
+MAX_LOADED_MODELS = 2
+
+# Response cache - identical conversations are answered from disk instead of
+# re-running the model. Least recently used entries are evicted beyond the limit.
+CACHE_FILE = Path(__file__).resolve().parent / ".cache" / "responses.sqlite3"
+CACHE_MAX_ENTRIES = 1000
+
+# Semantic cache (optional, off by default) - paraphrases of a previously
+# asked opening question are answered from cache. To enable, set this to True,
+# `pip install faiss-cpu numpy` and `ollama pull nomic-embed-text`.
+SEMANTIC_CACHE_ENABLED = False
+SEMANTIC_CACHE_THRESHOLD = 0.90
+SEMANTIC_INDEX_FILE = CACHE_FILE.parent / "semantic.faiss"
+EMBED_MODEL = "nomic-embed-text"
+
 # UNCENSORED MODELS ONLY - No content restrictions
 # To add a new model, append to this list:
 # - 'name': The model identifier used by Ollama (e.g., from 'ollama pull <name>')
 # - 'description': Short description shown in model selection
 # - 'details': Additional details about capabilities or use cases
+# - 'ram_gb': Approximate RAM needed to run the model, in GB
+# - 'tags': Any of 'premium', 'recommended', 'classic', 'uncensored'
 #
 # All models below are FULLY UNCENSORED with no content filtering
 # Your system has 48GB RAM - can run up to 70B models
@@ -35,26 +91,72 @@ MODELS = [
     {
         'name': 'dolphin-mixtral:8x7b',
         'description': 'Dolphin Mixtral 8x7B Uncensored',
-        'details': 'BEST AVAILABLE - Top reasoning & instruction following (~26GB RAM)'
+        'details': 'BEST AVAILABLE - Top reasoning & instruction following (~26GB RAM)',
+        'ram_gb': 26,
+        'tags': ('premium', 'uncensored')
     },
 
     # RECOMMENDED UNCENSORED MODELS (Best Balance - Fast & Capable)
     {
         'name': 'dolphin-llama3:latest',
         'description': 'Dolphin Llama3 8B Uncensored',
-        'details': 'Best 8B uncensored model - High quality, fast responses (~8GB RAM)'
+        'details': 'Best 8B uncensored model - High quality, fast responses (~8GB RAM)',
+        'ram_gb': 8,
+        'tags': ('recommended', 'uncensored')
     },
     {
         'name': 'dolphin-mistral:latest',
         'description': 'Dolphin Mistral 7B Uncensored',
-        'details': 'Fast & reliable uncensored model, excellent general purpose (~8GB RAM)'
+        'details': 'Fast & reliable uncensored model, excellent general purpose (~8GB RAM)',
+        'ram_gb': 8,
+        'tags': ('recommended', 'uncensored')
     },
     {
         'name': 'wizardlm-uncensored:13b',
         'description': 'WizardLM Uncensored 13B',
-        'details': 'Classic uncensored model, great for instructions and tasks (~13GB RAM)'
+        'details': 'Classic uncensored model, great for instructions and tasks (~13GB RAM)',
+        'ram_gb': 13,
+        'tags': ('classic', 'uncensored')
     }
 ]
 
+
+def get_models(tag=None, max_ram=None):
+    """
+    Filter the configured models.
+
+    Args:
+        tag (str | None): Only include models with this tag
+        max_ram (float | None): Only include models needing at most this
+                                many GB of RAM
+
+    Returns:
+        list: Matching entries of MODELS, in their configured order
+
+    Example:
+        >>> [m['name'] for m in get_models(tag='recommended')]
+        ['dolphin-llama3:latest', 'dolphin-mistral:latest']
+    """
+    return [
+        model for model in MODELS
+        if (tag is None or tag in model['tags'])
+        and (max_ram is None or model['ram_gb'] <= max_ram)
+    ]
+
+
+# Total RAM of this machine, used to hide models that would fail to load
+SYSTEM_RAM_GB = psutil.virtual_memory().total / 1e9 if psutil else None
+
+# Model selection menu, built once at import. Falls back to every model
+# if none fit (or RAM could not be detected).
+MODEL_INDEX = {
+    str(i + 1): model
+    for i, model in enumerate(get_models(max_ram=SYSTEM_RAM_GB) or MODELS)
+}
+MODEL_MENU = "\n".join(
+    f"{key}. {model['description']} - {model['details']}"
+    for key, model in MODEL_INDEX.items()
+)
+
 # UI formatting constant
 SEPARATOR = "=" * 60
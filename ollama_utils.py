@@ -11,7 +11,15 @@ Functions:
     verify_ollama() -> tuple[bool, str | None]
     check_ollama_running() -> bool
     list_installed_models() -> str
-    download_model(name: str) -> bool
+    encode_messages(messages: list) -> bytes
+    chat_request_body(model_name: str, messages: list, stream: bool) -> bytes
+    error_message(status_code: int, reason: str, body: bytes, model_name: str) -> str
+    parse_chat_line(line: bytes) -> tuple[str, bool, str | None]
+    chat_completion(model_name: str, messages: list) -> str
+    stream_chat(model_name: str, messages: list) -> Iterator[str]
+    embed_text(text: str) -> list[float] | None
+    preload_model(model_name: str, timeout: float, keep_alive: str) -> tuple[bool, str | None]
+    download_model(name: str, quiet: bool) -> bool
     download_all_models(interactive: bool) -> bool
     setup_environment() -> bool
     print_env_setup_instructions() -> None
@@ -24,9 +32,71 @@ Usage:
         download_all_models(interactive=True)
 """
 
+import json
 import os
+import re
+import shutil
 import subprocess
-from config import MODEL_DIR, MODELS, SEPARATOR
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import requests
+
+try:
+    import orjson
+except ImportError:  # Falls back to the standard json module
+    orjson = None
+
+from config import (
+    EMBED_MODEL,
+    KEEP_ALIVE,
+    MAX_LOADED_MODELS,
+    MODEL_DIR,
+    MODELS,
+    NUM_PARALLEL,
+    OLLAMA_HOST,
+    SEPARATOR
+)
+
+# Number of models pulled concurrently by download_all_models(). Pulls are
+# network/disk bound; two at a time uses the bandwidth without thrashing disk.
+DOWNLOAD_WORKERS = 2
+
+# Timeout in seconds for quick requests (version, installed models, embeddings)
+PROBE_TIMEOUT = 5
+
+# Timeout in seconds for loading a model into memory before chatting
+PRELOAD_TIMEOUT = 60
+
+# Full path of the ollama executable, resolved once instead of searching
+# PATH on every subprocess call
+OLLAMA_BIN = shutil.which('ollama') or 'ollama'
+
+# Windows: start captured (quiet) subprocesses without opening a console window
+_NO_WINDOW = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+
+# Lines of 'ollama pull' output kept to report a failed quiet download
+_ERROR_TAIL_LINES = 5
+
+# MODEL_DIR as a string, for environment variables
+_MODEL_DIR_STR = os.fspath(MODEL_DIR)
+
+# Environment for 'ollama pull', built once on first use by _download_env()
+_DOWNLOAD_ENV = None
+
+# Number of encoded messages memoized by _encode_message(); comfortably more
+# than a compacted conversation holds
+_ENCODED_MESSAGE_CACHE = 1024
+
+# Request headers for pre-encoded JSON bodies
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Shared HTTP session - reuses the keep-alive connection to the Ollama
+# service across requests instead of reconnecting on every call
+_session = requests.Session()
 
 
 def verify_ollama():
@@ -42,14 +112,27 @@ def verify_ollama():
         >>> is_installed, version = verify_ollama()
         >>> if is_installed:
         ...     print(f"Ollama version: {version}")
+
+    Note:
+        Queries the /api/version endpoint of the local Ollama service first.
+        If the service is not running, falls back to 'ollama --version' so
+        an installed but stopped Ollama is still reported as installed.
     """
+    try:
+        response = _session.get(f"{OLLAMA_HOST}/api/version", timeout=PROBE_TIMEOUT)
+        if response.status_code == 200:
+            return True, response.json().get("version")
+    except (requests.RequestException, ValueError):
+        pass
+
     try:
         result = subprocess.run(
-            ['ollama', '--version'],
+            [OLLAMA_BIN, '--version'],
             capture_output=True,
             text=True,
             encoding='utf-8',
-            errors='replace'
+            errors='replace',
+            creationflags=_NO_WINDOW
         )
         if result.returncode == 0:
             return True, result.stdout.strip()
@@ -63,68 +146,433 @@ def check_ollama_running():
     Check if the Ollama service is running and responsive.
 
     Returns:
-        bool: True if Ollama responds to commands, False otherwise
+        bool: True if Ollama responds to requests, False otherwise
 
     Note:
-        This performs a lightweight check using 'ollama list' command.
-        It's faster than verify_ollama() but doesn't return version info.
+        This performs a lightweight check against the /api/version endpoint.
+        It's equivalent to verify_ollama() but doesn't return version info.
     """
     try:
-        result = subprocess.run(
-            ['ollama', 'list'],
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace'
-        )
-        return result.returncode == 0
-    except FileNotFoundError:
+        response = _session.get(f"{OLLAMA_HOST}/api/version", timeout=PROBE_TIMEOUT)
+        return response.status_code == 200
+    except requests.RequestException:
         return False
 
 
+def _format_size(num_bytes):
+    """
+    Format a byte count the way 'ollama list' does (decimal units).
+
+    Args:
+        num_bytes (int): Size in bytes
+
+    Returns:
+        str: Human readable size, e.g. '4.1 GB'
+    """
+    size = float(num_bytes)
+    for unit in ['B', 'KB', 'MB']:
+        if size < 1000:
+            return f"{size:.0f} {unit}"
+        size /= 1000
+    return f"{size:.1f} GB"
+
+
+def _format_age(timestamp):
+    """
+    Format an API timestamp as a relative age, e.g. '2 days ago'.
+
+    Args:
+        timestamp (str): ISO 8601 timestamp from the Ollama API
+
+    Returns:
+        str: Relative age, or the raw timestamp if it cannot be parsed
+    """
+    try:
+        # Trim nanoseconds and 'Z' so fromisoformat() accepts the value
+        cleaned = re.sub(r'\.\d+', '', timestamp).replace('Z', '+00:00')
+        modified = datetime.fromisoformat(cleaned)
+    except ValueError:
+        return timestamp
+    seconds = (datetime.now(timezone.utc) - modified).total_seconds()
+    for unit, length in [('year', 31536000), ('month', 2592000), ('week', 604800),
+                         ('day', 86400), ('hour', 3600), ('minute', 60)]:
+        if seconds >= length:
+            count = int(seconds // length)
+            return f"{count} {unit}{'s' if count != 1 else ''} ago"
+    return "Just now"
+
+
 def list_installed_models():
     """
     Get a formatted list of all models currently installed.
 
     Returns:
-        str: Formatted output from 'ollama list' command, or empty string on failure
+        str: Table of installed models in the same layout as 'ollama list',
+             or empty string on failure
 
     Example output:
         NAME                    ID              SIZE    MODIFIED
         dolphin-mistral:latest  abc123def456    4.1 GB  2 days ago
     """
     try:
-        result = subprocess.run(
-            ['ollama', 'list'],
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace'
-        )
-        return result.stdout if result.returncode == 0 else ""
-    except Exception:
+        response = _session.get(f"{OLLAMA_HOST}/api/tags", timeout=PROBE_TIMEOUT)
+        if response.status_code != 200:
+            return ""
+        models = response.json().get("models", [])
+    except (requests.RequestException, ValueError):
         return ""
 
+    rows = [("NAME", "ID", "SIZE", "MODIFIED")]
+    for model in models:
+        rows.append((
+            model.get("name", ""),
+            model.get("digest", "")[:12],
+            _format_size(model.get("size", 0)),
+            _format_age(model.get("modified_at", ""))
+        ))
+    widths = [max(len(row[i]) for row in rows) for i in range(3)]
+    lines = [
+        "    ".join(cell.ljust(width) for cell, width in zip(row, widths)) + "    " + row[3]
+        for row in rows
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _dumps(value):
+    """
+    Serialize a value to compact UTF-8 JSON bytes.
+
+    Args:
+        value: JSON-serializable value
+
+    Returns:
+        bytes: Encoded JSON, using orjson when it is installed
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+@lru_cache(maxsize=_ENCODED_MESSAGE_CACHE)
+def _encode_message(role, content):
+    """
+    Encode a single conversation entry, memoized.
+
+    Args:
+        role (str): Message role
+        content (str): Message text
+
+    Returns:
+        bytes: JSON object for the message
+    """
+    return _dumps({"role": role, "content": content})
+
+
+def encode_messages(messages):
+    """
+    Encode a conversation as a JSON array.
 
-def download_model(model_name):
+    Args:
+        messages (list): Conversation as a list of {"role", "content"} dicts
+
+    Returns:
+        bytes: JSON array of the messages
+
+    Note:
+        Each message is encoded once and memoized, so on every turn only the
+        newly appended messages are serialized; earlier ones are reused and
+        joined. This relies on history entries never being modified.
+    """
+    return b"[" + b",".join(
+        _encode_message(msg["role"], msg["content"]) for msg in messages
+    ) + b"]"
+
+
+def chat_request_body(model_name, messages, stream):
+    """
+    Build the JSON body of an /api/chat request.
+
+    Args:
+        model_name (str): Name of the Ollama model to use
+        messages (list): Conversation as a list of {"role", "content"} dicts
+        stream (bool): Whether the reply should be streamed
+
+    Returns:
+        bytes: Request body, to be sent with JSON_HEADERS
+    """
+    return (
+        b'{"model":' + _dumps(model_name)
+        + b',"messages":' + encode_messages(messages)
+        + b',"stream":' + (b"true" if stream else b"false")
+        + b',"keep_alive":' + _dumps(KEEP_ALIVE)
+        + b"}"
+    )
+
+
+def error_message(status_code, reason, body, model_name):
+    """
+    Build the message for a failed Ollama API request.
+
+    Args:
+        status_code (int): HTTP status code of the response
+        reason (str): HTTP reason phrase, used if the body has no error text
+        body (bytes | str): Response body
+        model_name (str): Model the request was for, used in the hint
+
+    Returns:
+        str: The "error" text from Ollama's JSON body, with a pull hint
+            when the model is not installed
+    """
+    try:
+        error = json.loads(body).get("error")
+    except (ValueError, AttributeError):
+        error = None
+    message = error or f"{status_code} {reason}"
+    if status_code == 404:
+        message += f" (run: ollama pull {model_name})"
+    return message
+
+
+def parse_chat_line(line):
+    """
+    Parse one line of a streamed /api/chat response.
+
+    Args:
+        line (bytes | str): A line of the NDJSON stream
+
+    Returns:
+        tuple: (content: str, done: bool, error: str | None)
+            - content: Piece of the reply, empty if the line has none
+            - done: True if this is the last line of the reply
+            - error: Error reported by Ollama mid-stream, if any
+    """
+    if not line:
+        return "", False, None
+    chunk = json.loads(line)
+    content = chunk.get("message", {}).get("content", "")
+    return content, bool(chunk.get("done")), chunk.get("error")
+
+
+def _raise_for_status(response, model_name):
+    """
+    Raise an error carrying Ollama's own message for a failed request.
+
+    Args:
+        response (requests.Response): Response from the Ollama API
+        model_name (str): Model the request was for, used in the hint
+
+    Raises:
+        requests.HTTPError: If the response has an error status, with the
+            message from error_message()
+    """
+    if response.ok:
+        return
+    message = error_message(
+        response.status_code, response.reason, response.content, model_name
+    )
+    raise requests.HTTPError(message, response=response)
+
+
+def chat_completion(model_name, messages):
+    """
+    Send a conversation to the Ollama chat API and return the reply.
+
+    Args:
+        model_name (str): Name of the Ollama model to use
+        messages (list): Conversation as a list of {"role", "content"} dicts
+
+    Returns:
+        str: Content of the assistant's reply
+
+    Raises:
+        requests.RequestException: If the Ollama service is unreachable
+            or returns an error status
+
+    Note:
+        The model is kept loaded for KEEP_ALIVE after the request, so
+        subsequent turns do not pay the model load cost again.
+    """
+    response = _session.post(
+        f"{OLLAMA_HOST}/api/chat",
+        data=chat_request_body(model_name, messages, stream=False),
+        headers=JSON_HEADERS
+    )
+    _raise_for_status(response, model_name)
+    return response.json()["message"]["content"]
+
+
+def stream_chat(model_name, messages):
+    """
+    Stream the assistant's reply from the Ollama chat API token by token.
+
+    Args:
+        model_name (str): Name of the Ollama model to use
+        messages (list): Conversation as a list of {"role", "content"} dicts
+
+    Yields:
+        str: Pieces of the reply content as they are generated
+
+    Raises:
+        requests.RequestException: If the Ollama service is unreachable
+            or returns an error status
+
+    Example:
+        >>> for token in stream_chat('dolphin-mistral:latest', messages):
+        ...     print(token, end="", flush=True)
+
+    Note:
+        Closing the generator early (e.g. breaking out of the loop and
+        calling close()) closes the HTTP response, which makes Ollama
+        stop generating.
+    """
+    with _session.post(
+        f"{OLLAMA_HOST}/api/chat",
+        data=chat_request_body(model_name, messages, stream=True),
+        headers=JSON_HEADERS,
+        stream=True
+    ) as response:
+        _raise_for_status(response, model_name)
+        for line in response.iter_lines():
+            content, done, error = parse_chat_line(line)
+            if error:
+                raise requests.RequestException(error)
+            if content:
+                yield content
+            if done:
+                break
+
+
+def embed_text(text):
+    """
+    Compute an embedding vector for a piece of text.
+
+    Args:
+        text (str): Text to embed
+
+    Returns:
+        list[float] | None: Embedding from EMBED_MODEL, or None if the
+            embedding model is unavailable or takes longer than PROBE_TIMEOUT
+
+    Note:
+        Requires the embedding model to be pulled first
+        (e.g. 'ollama pull nomic-embed-text').
+    """
+    try:
+        response = _session.post(
+            f"{OLLAMA_HOST}/api/embeddings",
+            json={"model": EMBED_MODEL, "prompt": text, "keep_alive": KEEP_ALIVE},
+            timeout=PROBE_TIMEOUT
+        )
+        response.raise_for_status()
+        return response.json()["embedding"]
+    except (requests.RequestException, KeyError, ValueError):
+        return None
+
+
+def preload_model(model_name, timeout=PRELOAD_TIMEOUT, keep_alive=KEEP_ALIVE):
+    """
+    Load a model into memory ahead of the first request.
+
+    Args:
+        model_name (str): Name of the Ollama model to load
+        timeout (float): Seconds to wait for the model to finish loading
+        keep_alive (str): How long Ollama keeps the model loaded afterwards
+
+    Returns:
+        tuple: (is_loaded: bool, error: str | None)
+            - (True, None): the model is loaded and ready
+            - (False, None): still loading when the timeout expired
+            - (False, error): the model could not be loaded, e.g. it is not
+              installed or Ollama is not reachable
+
+    Example:
+        >>> is_loaded, error = preload_model('dolphin-mistral:latest')
+        >>> if error:
+        ...     print(f"Cannot use model: {error}")
+
+    Note:
+        Sends an empty prompt to /api/generate, which loads the model
+        without generating any tokens, and returns as soon as it is
+        resident. If the wait times out, Ollama keeps loading the model
+        and the next request picks it up.
+    """
+    try:
+        response = _session.post(
+            f"{OLLAMA_HOST}/api/generate",
+            json={"model": model_name, "prompt": "", "keep_alive": keep_alive},
+            timeout=timeout
+        )
+    except requests.Timeout:
+        return False, None
+    except requests.RequestException as e:
+        return False, str(e)
+
+    try:
+        _raise_for_status(response, model_name)
+    except requests.HTTPError as e:
+        return False, str(e)
+    return True, None
+
+
+def _download_env():
+    """
+    Get the environment used for 'ollama pull' subprocesses.
+
+    Returns:
+        dict: Copy of os.environ with OLLAMA_MODELS set to MODEL_DIR
+
+    Note:
+        Built on the first download (after setup_environment() has run) and
+        shared by every later pull, including concurrent ones, instead of
+        copying the whole environment per model.
+    """
+    global _DOWNLOAD_ENV
+    if _DOWNLOAD_ENV is None:
+        _DOWNLOAD_ENV = {**os.environ, 'OLLAMA_MODELS': _MODEL_DIR_STR}
+    return _DOWNLOAD_ENV
+
+
+def download_model(model_name, quiet=False):
     """
     Download a single model from the Ollama registry.
 
     Args:
         model_name (str): Name of the model to download (e.g., 'dolphin-mistral')
+        quiet (bool): If True, print one line when the pull starts instead of
+                      the progress bars, and the error output on failure.
+                      Used when several pulls run at once and their progress
+                      bars would interleave.
 
     Returns:
         bool: True if download succeeded, False otherwise
 
     Note:
         Downloads to the directory specified by MODEL_DIR via OLLAMA_MODELS env var.
+        In quiet mode the output is read as it is produced and only the last
+        few lines are kept for the error message, rather than buffering the
+        whole progress output of a multi-GB pull in memory.
     """
     try:
-        result = subprocess.run(
-            ['ollama', 'pull', model_name],
-            env={**os.environ, 'OLLAMA_MODELS': str(MODEL_DIR)}
-        )
-        return result.returncode == 0
+        if not quiet:
+            result = subprocess.run([OLLAMA_BIN, 'pull', model_name], env=_download_env())
+            return result.returncode == 0
+
+        print(f"Downloading {model_name}...", flush=True)
+        with subprocess.Popen(
+            [OLLAMA_BIN, 'pull', model_name],
+            env=_download_env(),
+            creationflags=_NO_WINDOW,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding='utf-8',
+            errors='replace'
+        ) as proc:
+            tail = deque(proc.stdout, maxlen=_ERROR_TAIL_LINES)
+        if proc.returncode != 0:
+            error = "\n".join(line.strip() for line in tail if line.strip())
+            print(f"Error downloading {model_name}: {error}")
+        return proc.returncode == 0
     except Exception as e:
         print(f"Error downloading {model_name}: {e}")
         return False
@@ -142,8 +590,8 @@ def download_all_models(interactive=True):
         bool: True if at least one model downloaded successfully, False otherwise
 
     Note:
-        Displays progress for each model and provides a summary at the end.
-        Models are downloaded sequentially to avoid overwhelming the system.
+        Up to DOWNLOAD_WORKERS models are pulled concurrently. Each model is
+        reported as soon as its pull finishes, followed by a summary.
     """
     print(f"\n{SEPARATOR}")
     print("DOWNLOADING MODELS")
@@ -160,17 +608,22 @@ def download_all_models(interactive=True):
             print("Download cancelled.")
             return False
 
-    success_count = 0
-    for model in MODELS:
-        print(f"\n{SEPARATOR}")
-        print(f"Downloading: {model['name']}")
-        print(SEPARATOR)
+    print(f"\nDownloading {len(MODELS)} models ({DOWNLOAD_WORKERS} at a time)...")
 
-        if download_model(model['name']):
-            print(f"✓ Successfully downloaded {model['name']}")
-            success_count += 1
-        else:
-            print(f"✗ Failed to download {model['name']}")
+    success_count = 0
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        # Submit every pull before waiting on any, so they actually overlap
+        futures = {
+            executor.submit(download_model, model['name'], True): model
+            for model in MODELS
+        }
+        for future in as_completed(futures):
+            model = futures[future]
+            if future.result():
+                print(f"✓ Successfully downloaded {model['name']}")
+                success_count += 1
+            else:
+                print(f"✗ Failed to download {model['name']}")
 
     print(f"\n{SEPARATOR}")
     print(f"Download complete: {success_count}/{len(MODELS)} models")
@@ -186,22 +639,31 @@ def setup_environment():
     Actions:
         1. Creates the MODEL_DIR directory if it doesn't exist
         2. Sets OLLAMA_MODELS environment variable for current session
+        3. Defaults OLLAMA_NUM_PARALLEL and OLLAMA_MAX_LOADED_MODELS, keeping
+           any values the user has already set
 
     Returns:
         bool: Always returns True
 
     Note:
-        This only affects the current Python session. For persistent setup,
-        use print_env_setup_instructions() to get system-level setup commands.
+        This only affects the current Python session and the processes it
+        starts (e.g. 'ollama pull'). The already running Ollama server does
+        not see these values - in particular the concurrency settings only
+        take effect once persisted with the commands from
+        print_env_setup_instructions() and the server is restarted.
     """
     MODEL_DIR.mkdir(parents=True, exist_ok=True)
-    os.environ['OLLAMA_MODELS'] = str(MODEL_DIR)
+    os.environ['OLLAMA_MODELS'] = _MODEL_DIR_STR
+    os.environ.setdefault('OLLAMA_NUM_PARALLEL', str(NUM_PARALLEL))
+    os.environ.setdefault('OLLAMA_MAX_LOADED_MODELS', str(MAX_LOADED_MODELS))
     return True
 
 
 def print_env_setup_instructions():
     """
-    Display instructions for setting OLLAMA_MODELS permanently on Windows.
+    Display instructions for setting Ollama environment variables permanently on Windows.
+
+    Covers OLLAMA_MODELS, OLLAMA_NUM_PARALLEL and OLLAMA_MAX_LOADED_MODELS.
 
     Prints formatted instructions for:
         - PowerShell (Administrator)
@@ -210,16 +672,24 @@ def print_env_setup_instructions():
 
     Note:
         After following these instructions, the Ollama service will
-        automatically use the custom model directory for all future operations.
+        automatically use the custom model directory and concurrency
+        settings for all future operations.
     """
+    env_vars = [
+        ("OLLAMA_MODELS", MODEL_DIR),
+        ("OLLAMA_NUM_PARALLEL", NUM_PARALLEL),
+        ("OLLAMA_MAX_LOADED_MODELS", MAX_LOADED_MODELS)
+    ]
     print(f"\n{SEPARATOR}")
-    print("IMPORTANT: Setting OLLAMA_MODELS environment variable")
+    print("IMPORTANT: Setting Ollama environment variables")
     print(SEPARATOR)
-    print("\nFor persistent setup, set the environment variable:")
+    print("\nFor persistent setup, set the environment variables:")
     print(f"\nWindows (PowerShell as Administrator):")
-    print(f'[System.Environment]::SetEnvironmentVariable("OLLAMA_MODELS", "{MODEL_DIR}", "Machine")')
+    for name, value in env_vars:
+        print(f'[System.Environment]::SetEnvironmentVariable("{name}", "{value}", "Machine")')
     print(f"\nWindows (Command Prompt as Administrator):")
-    print(f'setx OLLAMA_MODELS "{MODEL_DIR}" /M')
+    for name, value in env_vars:
+        print(f'setx {name} "{value}" /M')
     print("\nAfter setting, restart the Ollama service:")
     print("1. Open Task Manager")
     print("2. End the 'Ollama' process")
@@ -16,6 +16,9 @@ Tests Performed:
     3. Model response test (haiku generation)
     4. Creative prompt test (joke generation)
 
+    Tests 3 and 4 are sent to the model concurrently, after the model has
+    been loaded, so they measure generation rather than load time.
+
 Requirements:
     - Ollama must be installed and running
     - At least one model must be downloaded (preferably dolphin-mistral)
@@ -25,9 +28,20 @@ Expected Output:
     along with detailed output or error messages.
 """
 
-import subprocess
+import asyncio
+import time
+
+import httpx
+
+from chat_async import run_prompts
 from config import MODEL_DIR, MODELS, SEPARATOR
-from ollama_utils import verify_ollama, list_installed_models, setup_environment
+from ollama_utils import (
+    PRELOAD_TIMEOUT,
+    list_installed_models,
+    preload_model,
+    setup_environment,
+    verify_ollama
+)
 
 # Setup environment for test session
 setup_environment()
@@ -58,60 +72,58 @@ else:
 
 print()
 
-# Test 3: Send a test prompt
+# Tests 3 and 4 are independent, so both prompts are sent concurrently
+test_model = MODELS[0]['name']
+haiku_prompt = "Write a haiku about AI"
+joke_prompt = "Tell me a very short joke about robots"
+
 print("Test 3: Testing model with a prompt...")
-print("Prompt: 'Write a haiku about AI'")
+print(f"Prompt: '{haiku_prompt}'")
+print("Test 4: Testing with a creative prompt...")
+print(f"Prompt: '{joke_prompt}'")
 print()
 
-test_model = MODELS[0]['name']
-try:
-    result = subprocess.run(
-        ['ollama', 'run', test_model, "Write a haiku about AI"],
-        capture_output=True,
-        text=True,
-        encoding='utf-8',
-        errors='replace',
-        timeout=60
-    )
-    if result.returncode == 0:
-        print(f"✓ Response from {test_model}:")
-        print("-" * 60)
-        print(result.stdout.strip())
-        print("-" * 60)
-    else:
-        print(f"✗ Failed to get response: {result.stderr}")
-except subprocess.TimeoutExpired:
-    print("✗ Request timed out")
-except Exception as e:
-    print(f"✗ Error running model: {e}")
-
+# Load the model first and fail fast if it isn't available
+print(f"Loading {test_model}...")
+is_loaded, load_error = preload_model(test_model, keep_alive="5m")
+if load_error:
+    haiku_result = joke_result = Exception(f"Model {test_model} is not available: {load_error}")
+else:
+    if not is_loaded:
+        print(f"Model still loading after {PRELOAD_TIMEOUT}s, timings will include load time")
+    start = time.perf_counter()
+    try:
+        haiku_result, joke_result = asyncio.run(
+            run_prompts(test_model, [haiku_prompt, joke_prompt], timeout=60)
+        )
+    except Exception as e:
+        haiku_result = joke_result = e
+    print(f"Prompts completed in {time.perf_counter() - start:.1f}s")
 print()
 
-# Test 4: Quick conversation test
-print("Test 4: Testing with a creative prompt...")
-print("Prompt: 'Tell me a very short joke about robots'")
+# Test 3 result
+if isinstance(haiku_result, httpx.TimeoutException):
+    print("✗ Test 3: Request timed out")
+elif isinstance(haiku_result, Exception):
+    print(f"✗ Test 3: Error running model: {haiku_result}")
+else:
+    print(f"✓ Test 3: Response from {test_model}:")
+    print("-" * 60)
+    print(haiku_result.strip())
+    print("-" * 60)
+
 print()
 
-try:
-    result = subprocess.run(
-        ['ollama', 'run', test_model, "Tell me a very short joke about robots"],
-        capture_output=True,
-        text=True,
-        encoding='utf-8',
-        errors='replace',
-        timeout=60
-    )
-    if result.returncode == 0:
-        print("✓ Response:")
-        print("-" * 60)
-        print(result.stdout.strip())
-        print("-" * 60)
-    else:
-        print(f"✗ Failed: {result.stderr}")
-except subprocess.TimeoutExpired:
-    print("✗ Request timed out")
-except Exception as e:
-    print(f"✗ Error: {e}")
+# Test 4 result
+if isinstance(joke_result, httpx.TimeoutException):
+    print("✗ Test 4: Request timed out")
+elif isinstance(joke_result, Exception):
+    print(f"✗ Test 4: Error: {joke_result}")
+else:
+    print("✓ Test 4: Response:")
+    print("-" * 60)
+    print(joke_result.strip())
+    print("-" * 60)
 
 print()
 print(SEPARATOR)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Conversation History Compaction
+==============================================
+
+Checks that compact_history() in chat.py summarizes long conversations
+without re-summarizing on every turn. The model is replaced by a stub, so
+Ollama does not need to be running.
+
+Usage:
+    python -m unittest test_history
+"""
+
+import unittest
+from unittest import mock
+
+import chat
+from chat import HISTORY_MAX_CHARS, SUMMARY_PREFIX, compact_history, make_message
+
+
+def run_turns(turns, reply_chars, user_chars=20):
+    """
+    Simulate a chat, compacting after every reply as chat() does.
+
+    Args:
+        turns (int): Number of user/assistant exchanges
+        reply_chars (int): Length of every assistant reply
+        user_chars (int): Length of every user message
+
+    Returns:
+        tuple: (conversation: list, compacted_turns: list[int], summarize: Mock)
+    """
+    conversation = []
+    compacted_turns = []
+    with mock.patch.object(chat, 'chat_completion', return_value="short summary") as summarize:
+        for turn in range(1, turns + 1):
+            conversation.append(make_message("user", "u" * user_chars))
+            conversation.append(make_message("assistant", "a" * reply_chars))
+            if compact_history("test-model", conversation):
+                compacted_turns.append(turn)
+    return conversation, compacted_turns, summarize
+
+
+class CompactHistoryTest(unittest.TestCase):
+
+    def test_short_history_is_not_compacted(self):
+        conversation, compacted_turns, summarize = run_turns(3, reply_chars=500)
+        self.assertEqual(compacted_turns, [])
+        self.assertEqual(summarize.call_count, 0)
+        self.assertEqual(len(conversation), 6)
+
+    def test_long_replies_do_not_compact_every_turn(self):
+        _, compacted_turns, summarize = run_turns(10, reply_chars=2800)
+        self.assertEqual(summarize.call_count, 4)
+        self.assertEqual(compacted_turns, [3, 5, 7, 9])
+
+    def test_compaction_keeps_summary_and_recent_exchange(self):
+        conversation, _, _ = run_turns(3, reply_chars=2800)
+        self.assertEqual(conversation[0]["role"], "system")
+        self.assertTrue(conversation[0]["content"].startswith(SUMMARY_PREFIX))
+        self.assertEqual([msg["role"] for msg in conversation[1:]], ["user", "assistant"])
+        unsummarized = sum(len(msg["content"]) for msg in conversation[1:])
+        self.assertLessEqual(unsummarized, HISTORY_MAX_CHARS)
+
+    def test_summary_request_ends_with_instruction(self):
+        _, _, summarize = run_turns(3, reply_chars=2800)
+        model_name, messages = summarize.call_args[0]
+        self.assertEqual(model_name, "test-model")
+        self.assertEqual(messages[-1]["content"], chat.SUMMARY_INSTRUCTION)
+
+
+if __name__ == "__main__":
+    unittest.main()